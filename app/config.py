@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -19,6 +20,8 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    STATISTICS_CACHE_TTL_SECONDS: int = 30
 
     # JWT (from auth-api)
     JWT_SECRET_KEY: str
@@ -26,6 +29,7 @@ class Settings(BaseSettings):
 
     # External APIs
     EMAIL_API_URL: str
+    EMAIL_BULK_ENABLED: bool = False  # email-api exposes POST /emails/send_bulk
     AUTH_API_URL: str
 
     # Rate Limiting
@@ -38,4 +42,9 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process (tests can reset with get_settings.cache_clear())"""
+    return Settings()
+
+settings = get_settings()
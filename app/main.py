@@ -1,44 +1,101 @@
 from fastapi import FastAPI, Request, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import asyncio
+import logging
+import logging.handlers
+import orjson
+import queue
 import structlog
+import sys
+import time
 
 from app.config import settings
 from app.services.database import db
 from app.services.email import email_client
+from app.services.redis_client import redis_client
+from app.middleware.auth import AuthMiddleware
 from app.middleware.correlation import CorrelationMiddleware
+from app.middleware.cors import CORSMiddleware
+from app.middleware.rate_limit import rate_limiter
 
 # Import all routers
 from app.routes import reports, photos, users, content, statistics
 
 # Configure structured logging
-structlog.configure(
-    processors=[
+log_level = logging.getLevelName(settings.LOG_LEVEL.upper())
+
+# All log output goes through a queue; a background thread does the blocking stdout writes
+log_queue = queue.SimpleQueue()
+
+class _QueueBytesLogger:
+    """structlog logger that enqueues rendered lines for log_listener instead of writing them"""
+
+    def msg(self, message: bytes):
+        log_queue.put_nowait(logging.makeLogRecord(
+            {"msg": message.decode(), "levelno": logging.INFO, "levelname": "INFO"}
+        ))
+
+    debug = info = warning = warn = error = critical = fatal = exception = msg
+
+if settings.ENVIRONMENT == "production":
+    # orjson renders straight to bytes, handed to the queue without the stdlib logging chain
+    log_processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.JSONRenderer(serializer=orjson.dumps),
+    ]
+    _queue_bytes_logger = _QueueBytesLogger()
+    log_factory = lambda *args: _queue_bytes_logger
+else:
+    log_processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer() if settings.ENVIRONMENT == "production"
-        else structlog.dev.ConsoleRenderer(),
-    ],
-    wrapper_class=structlog.stdlib.BoundLogger,
+        structlog.dev.ConsoleRenderer(),
+    ]
+    log_factory = structlog.stdlib.LoggerFactory()
+
+structlog.configure(
+    processors=log_processors,
+    # Calls below LOG_LEVEL are no-ops that never reach the processor chain
+    wrapper_class=structlog.make_filtering_bound_logger(log_level),
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
+    logger_factory=log_factory,
     cache_logger_on_first_use=True,
 )
 
+# stdlib logging (dev output, third-party loggers) uses the same queue
+root_logger = logging.getLogger()
+root_logger.handlers.clear()
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+root_logger.setLevel(log_level)
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.StreamHandler(sys.stdout),
+    respect_handler_level=True
+)
+
 logger = structlog.get_logger()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
+    log_listener.start()
     logger.info("application_starting", environment=settings.ENVIRONMENT)
     await db.connect()
+    await rate_limiter.load()
+    email_client.start()
+
+    # Build and serialize the OpenAPI schema now instead of on the first /openapi.json request
+    if settings.ENABLE_DOCS:
+        global _openapi_bytes
+        _openapi_bytes = orjson.dumps(app.openapi())
+
     logger.info("application_started")
 
     yield
@@ -47,7 +104,9 @@ async def lifespan(app: FastAPI):
     logger.info("application_stopping")
     await db.disconnect()
     await email_client.close()
+    await redis_client.close()
     logger.info("application_stopped")
+    log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
@@ -69,9 +128,10 @@ Features admin/moderator workflows, automated filtering, photo moderation, and e
 - Database: PostgreSQL with `activity` schema
 - Email: Integration with email-service
 - Auth: JWT Bearer with role validation""",
-    docs_url="/docs" if settings.ENABLE_DOCS else None,
-    redoc_url="/redoc" if settings.ENABLE_DOCS else None,
-    openapi_url="/openapi.json" if settings.ENABLE_DOCS else None,
+    # Docs routes are registered below as pre-rendered responses
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
     contact={"name": "Activity Platform Team", "email": "dev@activityapp.com"},
     license_info={"name": "Proprietary"},
     lifespan=lifespan
@@ -103,27 +163,52 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-# Configure rate limiter with Redis storage
-limiter = Limiter(
-    key_func=get_remote_address,
-    storage_uri=settings.REDIS_URL,
-    enabled=settings.RATE_LIMIT_ENABLED
-)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# API documentation served from bytes rendered once (schema at startup, HTML at import)
+_openapi_bytes: bytes | None = None
+
+if settings.ENABLE_DOCS:
+    _SWAGGER_UI_HTML = get_swagger_ui_html(
+        openapi_url="/openapi.json",
+        title=f"{settings.PROJECT_NAME} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect"
+    ).body
+    _SWAGGER_UI_REDIRECT_HTML = get_swagger_ui_oauth2_redirect_html().body
+    _REDOC_HTML = get_redoc_html(
+        openapi_url="/openapi.json",
+        title=f"{settings.PROJECT_NAME} - ReDoc"
+    ).body
+
+    @app.get("/openapi.json", include_in_schema=False)
+    async def openapi_json():
+        global _openapi_bytes
+        if _openapi_bytes is None:
+            _openapi_bytes = orjson.dumps(app.openapi())
+        return Response(content=_openapi_bytes, media_type="application/json")
+
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui_html():
+        return Response(content=_SWAGGER_UI_HTML, media_type="text/html")
+
+    @app.get("/docs/oauth2-redirect", include_in_schema=False)
+    async def swagger_ui_redirect():
+        return Response(content=_SWAGGER_UI_REDIRECT_HTML, media_type="text/html")
+
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc_html():
+        return Response(content=_REDOC_HTML, media_type="text/html")
+
+# Add JWT authentication middleware (innermost: runs after CORS preflight handling)
+app.add_middleware(AuthMiddleware, prefix=settings.API_V1_PREFIX)
+
+# Add CORS middleware (allows all origins - configure appropriately for production)
+app.add_middleware(CORSMiddleware)
 
 # Add correlation ID middleware
 app.add_middleware(CorrelationMiddleware)
 
+# Constant body for unexpected errors, encoded once
+_ERROR_500_BODY = b'{"detail":"Internal server error occurred"}'
+
 # Global exception handler for unexpected errors
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -135,43 +220,62 @@ async def global_exception_handler(request: Request, exc: Exception):
         path=request.url.path,
         method=request.method
     )
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"detail": "Internal server error occurred"}
+    return Response(
+        content=_ERROR_500_BODY,
+        media_type="application/json",
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
     )
 
+# Last successful health probe as (monotonic time, result), reused for a short window
+_health_cache: tuple[float, dict] | None = None
+_HEALTH_CACHE_SECONDS = 2.0
+_HEALTH_DB_TIMEOUT_SECONDS = 0.5
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    global _health_cache
+    if _health_cache is not None and time.monotonic() - _health_cache[0] < _HEALTH_CACHE_SECONDS:
+        return dict(_health_cache[1])
+
     health_status = {"status": "ok", "service": "moderation-api"}
 
-    # Check database connection
+    # Check database connection (bounded, so an exhausted pool reports degraded quickly)
     try:
         if db.pool:
-            await db.fetch_one("SELECT 1")
+            await asyncio.wait_for(db.fetch_one("SELECT 1"), timeout=_HEALTH_DB_TIMEOUT_SECONDS)
             health_status["database"] = "ok"
         else:
             health_status["database"] = "not_connected"
             health_status["status"] = "degraded"
+    except asyncio.TimeoutError:
+        health_status["database"] = "timeout"
+        health_status["status"] = "degraded"
     except Exception as e:
         health_status["database"] = f"error: {str(e)}"
         health_status["status"] = "degraded"
 
+    # Only cache healthy results so a failure is re-probed on the next request
+    if health_status["status"] == "ok":
+        _health_cache = (time.monotonic(), health_status)
+
     return health_status
 
 # Include all routers with moderation prefix
-app.include_router(reports.router, prefix=settings.API_V1_PREFIX)
-app.include_router(photos.router, prefix=settings.API_V1_PREFIX)
-app.include_router(users.router, prefix=settings.API_V1_PREFIX)
-app.include_router(content.router, prefix=settings.API_V1_PREFIX)
-app.include_router(statistics.router, prefix=settings.API_V1_PREFIX)
+for route_module in (reports, photos, users, content, statistics):
+    app.include_router(route_module.router, prefix=settings.API_V1_PREFIX)
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        # reload only supports a single worker
+        workers=1 if settings.DEBUG else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
     )
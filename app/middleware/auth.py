@@ -1,75 +1,317 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from contextvars import ContextVar
+from fastapi import Depends, HTTPException, Request, status
+from jwt import PyJWTError as JWTError
+from uuid import UUID
 from app.config import settings
 from app.services.database import db
+from app.services.redis_client import redis_client
+from app.utils.json import dumps as json_dumps, loads as json_loads
+import hashlib
+import json
+import jwt
 import structlog
+import time
 
 logger = structlog.get_logger()
-security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> dict:
+# Encode the HMAC secret once instead of on every decode
+_JWT_SECRET = settings.JWT_SECRET_KEY.encode()
+_JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+
+# Verified users keyed by token digest: digest -> (expires_at, user dict)
+_TOKEN_CACHE: dict[bytes, tuple[float, dict]] = {}
+# Digests cached per user, so invalidate_user() can evict that user's tokens
+_TOKEN_DIGESTS_BY_USER: dict[str, set[bytes]] = {}
+# This process's copy can't be purged from other workers: the TTL is the upper
+# bound on how long a ban or role change takes to apply there
+_TTL_SECONDS = 5
+_TOKEN_CACHE_MAX_SIZE = 4096
+
+# Roles allowed to use moderation endpoints
+_ADMIN_ROLES: frozenset[str] = frozenset({"admin", "moderator"})
+
+# Users already loaded during the current request: user_id -> record
+_request_user_cache: ContextVar[dict | None] = ContextVar("user_cache", default=None)
+
+_USER_COLUMNS = "user_id, email, roles, is_verified, status"
+
+# Pre-encoded error responses for the common rejection paths
+_JSON_CONTENT_TYPE = (b"content-type", b"application/json")
+_INVALID_CREDENTIALS = "Invalid authentication credentials"
+_ERROR_BODIES = {
+    (status.HTTP_401_UNAUTHORIZED, _INVALID_CREDENTIALS): b'{"detail":"Invalid authentication credentials"}',
+    (status.HTTP_403_FORBIDDEN, "Not authenticated"): b'{"detail":"Not authenticated"}',
+    (status.HTTP_403_FORBIDDEN, _INVALID_CREDENTIALS): b'{"detail":"Invalid authentication credentials"}',
+}
+
+def _user_cache_key(user_id: str) -> str:
+    return f"auth:user:{user_id}"
+
+def _user_from_row(row) -> dict:
+    """Normalize a users row into the dict shape shared by all user caches"""
+    return {
+        "user_id": str(row["user_id"]),
+        "email": row["email"],
+        # JSONB, already decoded to a list by the pool's json codec
+        "roles": row["roles"] or [],
+        "is_verified": row["is_verified"],
+        "status": row["status"]
+    }
+
+async def fetch_user(user_id: str):
+    """
+    Fetch a single user, reusing a lookup already made during this request.
+
+    Checks the per-request cache, then the shared Redis cache, then the
+    database. Records loaded from the database are cached in Redis for
+    AUTH_USER_CACHE_TTL_SECONDS (see invalidate_user).
+
+    Returns:
+        dict-like record with user_id, email, roles, is_verified, status (or None)
+    """
+    cache = _request_user_cache.get()
+    if cache is not None and user_id in cache:
+        return cache[user_id]
+
+    cache_key = _user_cache_key(user_id)
+    raw = await redis_client.cache_get(cache_key)
+    if raw is not None:
+        user_record = json_loads(raw)
+    else:
+        row = await db.fetch_one(
+            f"SELECT {_USER_COLUMNS} FROM activity.users WHERE user_id = $1",
+            user_id
+        )
+        user_record = None
+        if row is not None:
+            user_record = _user_from_row(row)
+            await redis_client.cache_set(cache_key, json_dumps(user_record), settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+    if cache is not None:
+        cache[user_id] = user_record
+    return user_record
+
+def _drop_cached_token(digest: bytes):
+    """Remove one token cache entry and its per-user index reference"""
+    entry = _TOKEN_CACHE.pop(digest, None)
+    if entry is None:
+        return
+    user_id = entry[1]["user_id"]
+    digests = _TOKEN_DIGESTS_BY_USER.get(user_id)
+    if digests is not None:
+        digests.discard(digest)
+        if not digests:
+            del _TOKEN_DIGESTS_BY_USER[user_id]
+
+async def invalidate_user(user_id: str):
+    """
+    Drop a user's cached record so the next request reloads it (e.g. after a ban).
+
+    Clears the shared Redis record and this process's verified tokens for the
+    user. Other workers pick up the change once their token cache entries
+    expire (at most _TTL_SECONDS).
+    """
+    # Cache keys use the canonical form (lowercase, hyphenated)
+    user_id = str(UUID(str(user_id)))
+    for digest in _TOKEN_DIGESTS_BY_USER.pop(user_id, ()):
+        _TOKEN_CACHE.pop(digest, None)
+    await redis_client.cache_delete(_user_cache_key(user_id))
+
+async def fetch_users(user_ids: list[str]) -> dict:
+    """
+    Fetch several users with at most one Redis and one database round trip.
+
+    Uses the same caches as fetch_user: the per-request cache, then the shared
+    Redis cache (MGET), then a single database query for the rest.
+
+    Returns:
+        dict of user_id -> user dict (same shape as fetch_user; unknown IDs are omitted)
+    """
+    cache = _request_user_cache.get()
+    if cache is None:
+        cache = {}
+
+    missing = [user_id for user_id in user_ids if user_id not in cache]
+    if missing:
+        cached = await redis_client.cache_get_many([_user_cache_key(user_id) for user_id in missing])
+        for user_id, raw in zip(missing, cached):
+            if raw is not None:
+                cache[user_id] = json_loads(raw)
+
+        missing = [user_id for user_id in missing if user_id not in cache]
+        if missing:
+            rows = await db.fetch_all(
+                f"SELECT {_USER_COLUMNS} FROM activity.users WHERE user_id = ANY($1::uuid[])",
+                missing
+            )
+            loaded = {}
+            for row in rows:
+                user_record = _user_from_row(row)
+                loaded[user_record["user_id"]] = user_record
+            if loaded:
+                await redis_client.cache_set_many(
+                    {_user_cache_key(user_id): json_dumps(user_record) for user_id, user_record in loaded.items()},
+                    settings.AUTH_USER_CACHE_TTL_SECONDS
+                )
+            # Unknown IDs are remembered as None, like fetch_user does
+            for user_id in missing:
+                cache[user_id] = loaded.get(user_id)
+
+    return {user_id: cache[user_id] for user_id in user_ids if cache.get(user_id) is not None}
+
+async def authenticate(token: str) -> dict:
     """
-    Extract and validate user from JWT token.
+    Validate JWT token and load the user it belongs to.
     Fetches user details from database since auth-api JWTs contain minimal claims.
 
+    Args:
+        token: Raw bearer token
+
     Returns:
         dict with user_id, email, roles
+
+    Raises:
+        HTTPException: 401/403 if the token or account is not valid
     """
+    # Repeat requests with the same token skip JWT verification and DB lookup
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        if time.monotonic() < cached[0]:
+            return cached[1]
+        _drop_cached_token(cache_key)
+
     try:
         # Decode JWT token
         payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
+            token,
+            _JWT_SECRET,
+            algorithms=_JWT_ALGORITHMS
+        )
+    except JWTError as e:
+        logger.error("jwt_validation_failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=_INVALID_CREDENTIALS
         )
 
-        # Extract user_id from 'sub' claim
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
+    # Extract user_id from 'sub' claim
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=_INVALID_CREDENTIALS
+        )
 
-        # Fetch user details from database (auth-api JWT has minimal claims)
-        user_record = await db.fetch_one(
-            "SELECT user_id, email, roles, is_verified, status FROM activity.users WHERE user_id = $1",
-            user_id
+    # Fetch user details from database (auth-api JWT has minimal claims)
+    user_record = await fetch_user(user_id)
+
+    if user_record is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=_INVALID_CREDENTIALS
         )
 
-        if user_record is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
+    # Check if user is verified and active
+    if not user_record["is_verified"]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email not verified"
+        )
 
-        # Check if user is verified and active
-        if not user_record["is_verified"]:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Email not verified"
-            )
+    if user_record["status"] != "active":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Account is {user_record['status']}"
+        )
 
-        if user_record["status"] != "active":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Account is {user_record['status']}"
-            )
+    user = {
+        "user_id": str(user_record["user_id"]),
+        "email": user_record["email"],
+        # roles list normalized to a frozenset for O(1) role checks
+        "roles": frozenset(user_record["roles"] or ())
+    }
 
-        return {
-            "user_id": str(user_record["user_id"]),
-            "email": user_record["email"],
-            "roles": user_record["roles"] or []
-        }
-    except JWTError as e:
-        logger.error("jwt_validation_failed", error=str(e))
+    # Never cache past the token's own expiry
+    ttl = _TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX_SIZE:
+            # FIFO eviction (dicts keep insertion order)
+            _drop_cached_token(next(iter(_TOKEN_CACHE)))
+        _TOKEN_CACHE[cache_key] = (time.monotonic() + ttl, user)
+        _TOKEN_DIGESTS_BY_USER.setdefault(user["user_id"], set()).add(cache_key)
+
+    return user
+
+class AuthMiddleware:
+    """
+    Authenticate every request under the API prefix (pure ASGI).
+
+    Validates the bearer token once, before routing, and stores the user in
+    scope["state"]["user"] (read by get_current_user). Invalid requests are
+    rejected here without reaching FastAPI.
+    """
+
+    def __init__(self, app, prefix: str):
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            return await self.app(scope, receive, send)
+
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+                break
+
+        # Same responses as FastAPI's HTTPBearer for missing/malformed headers
+        if not authorization:
+            return await _send_error(send, status.HTTP_403_FORBIDDEN, "Not authenticated")
+
+        scheme, _, token = authorization.partition(b" ")
+        if scheme.lower() != b"bearer" or not token:
+            return await _send_error(send, status.HTTP_403_FORBIDDEN, _INVALID_CREDENTIALS)
+
+        # Per-request user cache, shared with fetch_user/fetch_users in routes
+        cache_token = _request_user_cache.set({})
+        try:
+            try:
+                user = await authenticate(token.decode("latin-1"))
+            except HTTPException as e:
+                return await _send_error(send, e.status_code, e.detail)
+
+            scope.setdefault("state", {})["user"] = user
+            await self.app(scope, receive, send)
+        finally:
+            _request_user_cache.reset(cache_token)
+
+async def _send_error(send, status_code: int, detail: str):
+    """Send a JSON error response directly over ASGI"""
+    body = _ERROR_BODIES.get((status_code, detail))
+    if body is None:
+        body = json.dumps({"detail": detail}, separators=(",", ":")).encode()
+    # Fresh list per response: outer middleware appends its headers to it in place
+    await send({"type": "http.response.start", "status": status_code, "headers": [_JSON_CONTENT_TYPE]})
+    await send({"type": "http.response.body", "body": body})
+
+async def get_current_user(request: Request) -> dict:
+    """
+    Return the user authenticated by AuthMiddleware.
+
+    Returns:
+        dict with user_id, email, roles
+    """
+    user = getattr(request.state, "user", None)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
+            detail=_INVALID_CREDENTIALS
         )
+    return user
 
 async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
     """
@@ -78,10 +320,10 @@ async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
     Returns:
         dict with user_id, email, roles
     """
-    roles = current_user.get("roles", [])
+    roles = current_user.get("roles") or ()
 
-    if "admin" not in roles and "moderator" not in roles:
-        logger.warning("insufficient_permissions", user_id=current_user["user_id"], roles=roles)
+    if _ADMIN_ROLES.isdisjoint(roles):
+        logger.warning("insufficient_permissions", user_id=current_user["user_id"], roles=sorted(roles))
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="INSUFFICIENT_PERMISSIONS: Admin or moderator role required"
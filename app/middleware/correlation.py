@@ -1,22 +1,37 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+import os
 import structlog
-import uuid
 
-class CorrelationMiddleware(BaseHTTPMiddleware):
-    """Add correlation ID to all requests for tracing"""
+class CorrelationMiddleware:
+    """Add correlation ID to all requests for tracing (pure ASGI)"""
 
-    async def dispatch(self, request: Request, call_next):
-        # Get correlation ID from header or generate new one
-        correlation_id = request.headers.get("X-Trace-ID") or str(uuid.uuid4())
+    def __init__(self, app):
+        self.app = app
 
-        # Bind to structlog context
-        structlog.contextvars.bind_contextvars(correlation_id=correlation_id)
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
 
-        # Process request
-        response = await call_next(request)
+        # Get correlation ID from header or generate new one (128 random bits as hex)
+        header_value = None
+        for name, value in scope["headers"]:
+            if name == b"x-trace-id":
+                header_value = value
+                break
+        if header_value:
+            correlation_id = header_value.decode("latin-1")
+        else:
+            correlation_id = os.urandom(16).hex()
+            header_value = correlation_id.encode("ascii")
 
-        # Add correlation ID to response header
-        response.headers["X-Trace-ID"] = correlation_id
+        header = (b"x-trace-id", header_value)
 
-        return response
+        async def send_wrapper(message):
+            # Add correlation ID to response header
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append(header)
+            await send(message)
+
+        # Bind to structlog context for this request only; the previous binding
+        # is restored on exit so nothing leaks into later work on the context
+        with structlog.contextvars.bound_contextvars(correlation_id=correlation_id):
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,58 @@
+# Response headers for the fixed CORS configuration (all origins, methods and
+# headers, credentials allowed), encoded once at import time
+_PREFLIGHT_HEADERS = [
+    (b"vary", b"Origin"),
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+]
+
+_SIMPLE_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-credentials", b"true"),
+]
+
+class CORSMiddleware:
+    """Wildcard CORS handling (pure ASGI), specialised from Starlette's CORSMiddleware"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        # Not a CORS request
+        if origin is None:
+            return await self.app(scope, receive, send)
+
+        # Preflight: answer directly without hitting the application.
+        # Credentials are allowed, so the origin is mirrored instead of "*",
+        # and requested headers are mirrored since "*" does not cover them.
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).extend(_SIMPLE_HEADERS)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
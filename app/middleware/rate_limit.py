@@ -0,0 +1,108 @@
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+from app.config import settings
+from app.services.redis_client import redis_client
+import math
+import os
+import structlog
+
+logger = structlog.get_logger()
+
+# Sliding-window log: drop entries older than the window, then admit the request
+# if fewer than the limit remain. Runs atomically in a single round trip using
+# the Redis server clock, so all workers share one view of the window.
+# Returns {1, 0} if allowed, {0, retry_after_ms} if rejected.
+RATE_LIMIT_SCRIPT = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+    return {1, 0}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+_PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+class RateLimiter:
+    """Redis-backed rate limiter shared by all workers"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        # EVALSHA per call, re-loading the script if Redis lost it
+        self.script = redis_client.client.register_script(RATE_LIMIT_SCRIPT)
+
+    async def load(self):
+        """Load the Lua script into Redis at startup"""
+        if not self.enabled:
+            return
+        try:
+            await redis_client.client.script_load(RATE_LIMIT_SCRIPT)
+            logger.info("rate_limit_script_loaded")
+        except RedisError as e:
+            # Rate limiting fails open; the script is loaded again on first use
+            logger.warning("rate_limit_script_load_failed", error=str(e))
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int]:
+        """
+        Record a request against a sliding window.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds)
+        """
+        allowed, retry_after_ms = await self.script(
+            keys=[key],
+            args=[window_seconds * 1000, limit, os.urandom(8).hex()]
+        )
+        return bool(allowed), math.ceil(retry_after_ms / 1000)
+
+# Global rate limiter instance
+rate_limiter = RateLimiter(enabled=settings.RATE_LIMIT_ENABLED)
+
+def rate_limit(limit: str):
+    """
+    Build a dependency enforcing a per-IP limit on a route.
+
+    Args:
+        limit: Limit string, e.g. "100/minute"
+
+    Usage:
+        @router.get("/path", dependencies=[Depends(rate_limit("100/minute"))])
+    """
+    max_requests, _, period = limit.partition("/")
+    max_requests = int(max_requests)
+    window_seconds = _PERIOD_SECONDS[period]
+    detail = f"Rate limit exceeded: {max_requests} per 1 {period}"
+
+    async def check_rate_limit(request: Request):
+        if not rate_limiter.enabled:
+            return
+
+        endpoint = request.scope["endpoint"]
+        client_ip = request.client.host if request.client else "127.0.0.1"
+        key = f"ratelimit:{endpoint.__module__}.{endpoint.__name__}:{client_ip}"
+
+        try:
+            allowed, retry_after = await rate_limiter.hit(key, max_requests, window_seconds)
+        except RedisError as e:
+            # Redis outage should not take the API down with it
+            logger.warning("rate_limit_check_failed", error=str(e), key=key)
+            return
+
+        if not allowed:
+            logger.warning("rate_limit_exceeded", key=key, limit=limit)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=detail,
+                headers={"Retry-After": str(max(retry_after, 1))}
+            )
+
+    return check_rate_limit
@@ -1,9 +1,14 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 from uuid import UUID
 
 # Report models
+# Allowed filter values for GET /reports (validated by set lookup, shown as enums in OpenAPI)
+ReportStatus = Literal["pending", "reviewing", "resolved", "dismissed"]
+ReportTargetType = Literal["user", "post", "comment", "activity", "community"]
+ReportType = Literal["spam", "harassment", "inappropriate", "fake", "no_show", "other"]
+
 class CreateReportRequest(BaseModel):
     target_type: str = Field(..., pattern="^(user|post|comment|activity|community)$")
     target_id: UUID
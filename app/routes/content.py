@@ -1,26 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 import asyncpg
-import json
 
 from app.models.requests import RemoveContentRequest
 from app.models.responses import RemoveContentResponse
 from app.services.database import db
 from app.services.email import email_client
 from app.middleware.auth import require_admin
+from app.middleware.rate_limit import rate_limit
 from app.utils.errors import map_sp_error_to_http
 import structlog
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="", tags=["content"])
-limiter = Limiter(key_func=get_remote_address)
 
-@router.post("/content/remove", response_model=RemoveContentResponse)
-@limiter.limit("100/minute")
+@router.post("/content/remove", response_model=RemoveContentResponse, dependencies=[Depends(rate_limit("100/minute"))])
 async def remove_content(
     request: Request,
     content_request: RemoveContentRequest,
+    background_tasks: BackgroundTasks,
     admin: dict = Depends(require_admin)
 ):
     """Remove or hide problematic content (posts, comments)"""
@@ -29,19 +26,21 @@ async def remove_content(
             "SELECT activity.sp_mod_remove_content($1, $2, $3, $4)",
             admin["user_id"],
             content_request.content_type,
-            str(content_request.content_id),
+            content_request.content_id,
             content_request.removal_reason
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
 
-        # Send content removal notification to author
-        author_email = data.get("author_email")  # Assume SP returns author email
-        author_username = data.get("author_username")  # Assume SP returns author username
+        # Send content removal notification to author (runs after the response is sent)
+        # Recipient details come back in the same SP result (no extra lookup round trip)
+        author_email = data.get("author_email")
+        author_username = data.get("author_username")
 
         if author_email:
-            await email_client.send_email(
+            background_tasks.add_task(
+                email_client.send_email,
                 to=author_email,
                 template="content_removed",
                 context={
@@ -52,7 +51,7 @@ async def remove_content(
             )
 
         logger.info("content_removed", content_type=content_request.content_type, content_id=str(content_request.content_id), admin_id=admin["user_id"])
-        return RemoveContentResponse(**data)
+        return data
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
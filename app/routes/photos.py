@@ -1,67 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from typing import Optional
 import asyncpg
-import json
 
 from app.models.requests import ModeratePhotoRequest
-from app.models.responses import GetPendingPhotosResponse, ModeratePhotoResponse, PendingPhoto
+from app.models.responses import GetPendingPhotosResponse, ModeratePhotoResponse
 from app.services.database import db
 from app.services.email import email_client
 from app.middleware.auth import require_admin
+from app.middleware.rate_limit import rate_limit
 from app.utils.errors import map_sp_error_to_http
+from app.utils.etag import etag_json_response
+from app.utils.json import dumps as json_dumps
+from app.utils.pagination import decode_cursor, next_cursor, pagination_suffix
 import structlog
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="", tags=["photos"])
-limiter = Limiter(key_func=get_remote_address)
 
-@router.get("/photos/pending", response_model=GetPendingPhotosResponse)
-@limiter.limit("100/minute")
+# Fixed start of the GetPendingPhotosResponse body; rows and pagination are appended
+_PENDING_PHOTOS_PREFIX = b'{"success":true,"pending_photos":'
+
+# Serialized directly (no response_model validation); schema documented via responses
+@router.get(
+    "/photos/pending",
+    response_model=None,
+    responses={200: {"model": GetPendingPhotosResponse}},
+    dependencies=[Depends(rate_limit("100/minute"))]
+)
 async def get_pending_photos(
     request: Request,
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Legacy offset pagination; must be 0 when cursor is given"),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor from the previous page (use instead of offset)"),
     admin: dict = Depends(require_admin)
 ):
     """Get list of users with pending main photo moderation"""
+    cursor_created_at, cursor_id = decode_cursor(cursor, offset)
     try:
         photos = await db.fetch_all(
-            "SELECT * FROM activity.sp_mod_get_pending_photos($1, $2, $3)",
+            "SELECT * FROM activity.sp_mod_get_pending_photos($1, $2, $3, $4, $5)",
             admin["user_id"],
             limit,
-            offset
+            offset,
+            cursor_created_at,
+            cursor_id
         )
 
-        # Convert asyncpg.Record to PendingPhoto objects
-        pending_photos_list = [
-            PendingPhoto(
-                user_id=row["user_id"],
-                username=row["username"],
-                email=row["email"],
-                main_photo_url=row["main_photo_url"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"]
-            )
-            for row in photos
-        ]
+        # SP columns match PendingPhoto one-to-one, so rows are serialized as-is
+        pending_photos_list = [dict(row) for row in photos]
 
-        return GetPendingPhotosResponse(
-            success=True,
-            pending_photos=pending_photos_list,
-            pagination={"limit": limit, "offset": offset, "total": len(pending_photos_list)}
+        body = _PENDING_PHOTOS_PREFIX + json_dumps(pending_photos_list) + pagination_suffix(
+            limit, offset, len(pending_photos_list), next_cursor(pending_photos_list, limit, "user_id")
         )
+        return etag_json_response(request, body)
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
         logger.error("get_pending_photos_failed", error=message, admin_id=admin["user_id"])
         raise HTTPException(status_code=status_code, detail=message)
 
-@router.post("/photos/moderate", response_model=ModeratePhotoResponse)
-@limiter.limit("100/minute")
+@router.post("/photos/moderate", response_model=ModeratePhotoResponse, dependencies=[Depends(rate_limit("100/minute"))])
 async def moderate_photo(
     request: Request,
     photo_request: ModeratePhotoRequest,
+    background_tasks: BackgroundTasks,
     admin: dict = Depends(require_admin)
 ):
     """Approve or reject a user's main profile photo"""
@@ -69,22 +71,23 @@ async def moderate_photo(
         result = await db.fetch_one(
             "SELECT activity.sp_mod_moderate_main_photo($1, $2, $3, $4)",
             admin["user_id"],
-            str(photo_request.user_id),
+            photo_request.user_id,
             photo_request.moderation_status,
             photo_request.rejection_reason
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
 
-        # Send email notification if rejected
+        # Send email notification if rejected (runs after the response is sent)
         if photo_request.moderation_status == "rejected" and photo_request.rejection_reason:
-            # Get user email from result
-            user_email = data.get("email")  # Assume SP returns email
-            username = data.get("username")  # Assume SP returns username
+            # Recipient details come back in the same SP result (no extra lookup round trip)
+            user_email = data.get("email")
+            username = data.get("username")
 
             if user_email:
-                await email_client.send_email(
+                background_tasks.add_task(
+                    email_client.send_email,
                     to=user_email,
                     template="photo_rejected",
                     context={
@@ -94,7 +97,7 @@ async def moderate_photo(
                 )
 
         logger.info("photo_moderated", user_id=str(photo_request.user_id), status=photo_request.moderation_status, admin_id=admin["user_id"])
-        return ModeratePhotoResponse(**data)
+        return data
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
@@ -1,23 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from typing import Optional
 import asyncpg
-import json
 
-from app.models.requests import CreateReportRequest, UpdateReportStatusRequest
+from app.models.requests import CreateReportRequest, ReportStatus, ReportTargetType, ReportType, UpdateReportStatusRequest
 from app.models.responses import CreateReportResponse, GetReportsResponse, SuccessResponse
 from app.services.database import db
 from app.middleware.auth import get_current_user, require_admin
+from app.middleware.rate_limit import rate_limit
 from app.utils.errors import map_sp_error_to_http
+from app.utils.etag import etag_json_response
+from app.utils.json import dumps as json_dumps
+from app.utils.pagination import decode_cursor, next_cursor, pagination_suffix
 import structlog
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="", tags=["reports"])
-limiter = Limiter(key_func=get_remote_address)
 
-@router.post("/reports", response_model=CreateReportResponse, status_code=201)
-@limiter.limit("10/minute")
+# Fixed start of the GetReportsResponse body; rows and pagination are appended
+_REPORTS_PREFIX = b'{"success":true,"reports":'
+
+@router.post("/reports", response_model=CreateReportResponse, status_code=201, dependencies=[Depends(rate_limit("10/minute"))])
 async def create_report(
     request: Request,
     report_request: CreateReportRequest,
@@ -30,85 +32,96 @@ async def create_report(
             current_user["user_id"],
             None,  # reported_user_id (SP determines this)
             report_request.target_type,
-            str(report_request.target_id),
+            report_request.target_id,
             report_request.report_type,
             report_request.description
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
 
         logger.info("report_created", report_id=data["report_id"], user_id=current_user["user_id"])
-        return CreateReportResponse(**data)
+        return data
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
         logger.error("create_report_failed", error=message, user_id=current_user["user_id"])
         raise HTTPException(status_code=status_code, detail=message)
 
-@router.get("/reports", response_model=GetReportsResponse)
-@limiter.limit("100/minute")
+# Serialized directly (no response_model validation); schema documented via responses
+@router.get(
+    "/reports",
+    response_model=None,
+    responses={200: {"model": GetReportsResponse}},
+    dependencies=[Depends(rate_limit("100/minute"))]
+)
 async def get_reports(
     request: Request,
-    status: Optional[str] = Query(None, pattern="^(pending|reviewing|resolved|dismissed)$"),
-    target_type: Optional[str] = Query(None, pattern="^(user|post|comment|activity|community)$"),
-    report_type: Optional[str] = Query(None, pattern="^(spam|harassment|inappropriate|fake|no_show|other)$"),
+    status: Optional[ReportStatus] = Query(None),
+    target_type: Optional[ReportTargetType] = Query(None),
+    report_type: Optional[ReportType] = Query(None),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Legacy offset pagination; must be 0 when cursor is given"),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor from the previous page (use instead of offset)"),
     admin: dict = Depends(require_admin)
 ):
     """Get reports with filtering (admin only)"""
+    cursor_created_at, cursor_id = decode_cursor(cursor, offset)
     try:
         reports = await db.fetch_all(
-            "SELECT * FROM activity.sp_mod_get_reports($1, $2, $3, $4, $5, $6)",
+            "SELECT * FROM activity.sp_mod_get_reports($1, $2, $3, $4, $5, $6, $7, $8)",
             admin["user_id"],
             status,
             target_type,
             report_type,
             limit,
-            offset
+            offset,
+            cursor_created_at,
+            cursor_id
         )
 
-        # Convert asyncpg.Record to dict
-        reports_list = []
-        for r in reports:
-            report_dict = dict(r)
-            # Convert report to proper format with nested objects
-            report_formatted = {
-                "report_id": report_dict["report_id"],
+        # Unpack each row positionally (fixed SP column order) into the ReportResponse layout
+        reports_list = [
+            {
+                "report_id": report_id,
                 "reporter": {
-                    "user_id": report_dict["reporter_user_id"],
-                    "username": report_dict["reporter_username"],
-                    "email": report_dict["reporter_email"]
+                    "user_id": reporter_user_id,
+                    "username": reporter_username,
+                    "email": reporter_email
                 },
                 "reported_user": {
-                    "user_id": report_dict["reported_user_id"],
-                    "username": report_dict["reported_username"],
-                    "email": report_dict["reported_email"]
-                } if report_dict.get("reported_user_id") else None,
-                "target_type": report_dict["target_type"],
-                "target_id": report_dict["target_id"],
-                "report_type": report_dict["report_type"],
-                "description": report_dict.get("description"),
-                "status": report_dict["status"],
-                "created_at": report_dict["created_at"],
-                "updated_at": report_dict["updated_at"]
+                    "user_id": reported_user_id,
+                    "username": reported_username,
+                    "email": reported_email
+                } if reported_user_id else None,
+                "target_type": target_type_,
+                "target_id": target_id,
+                "report_type": report_type_,
+                "description": description,
+                "status": status_,
+                "created_at": created_at,
+                "updated_at": updated_at
             }
-            reports_list.append(report_formatted)
-
-        return GetReportsResponse(
-            success=True,
-            reports=reports_list,
-            pagination={"limit": limit, "offset": offset, "total": len(reports_list)}
+            for (
+                report_id, reporter_user_id, reporter_username, reporter_email,
+                reported_user_id, reported_username, reported_email,
+                target_type_, target_id, report_type_, description, status_,
+                _reviewed_by_user_id, _reviewed_by_username, _reviewed_at, _resolution_notes,
+                created_at, updated_at
+            ) in reports
+        ]
+
+        body = _REPORTS_PREFIX + json_dumps(reports_list) + pagination_suffix(
+            limit, offset, len(reports_list), next_cursor(reports_list, limit, "report_id")
         )
+        return etag_json_response(request, body)
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
         logger.error("get_reports_failed", error=message, admin_id=admin["user_id"])
         raise HTTPException(status_code=status_code, detail=message)
 
-@router.get("/reports/{report_id}", response_model=dict)
-@limiter.limit("100/minute")
+@router.get("/reports/{report_id}", response_model=dict, dependencies=[Depends(rate_limit("100/minute"))])
 async def get_report_by_id(
     request: Request,
     report_id: str,
@@ -122,8 +135,8 @@ async def get_report_by_id(
             report_id
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
 
         logger.info("report_fetched", report_id=report_id, admin_id=admin["user_id"])
         return data
@@ -133,8 +146,7 @@ async def get_report_by_id(
         logger.error("get_report_failed", error=message, report_id=report_id, admin_id=admin["user_id"])
         raise HTTPException(status_code=status_code, detail=message)
 
-@router.patch("/reports/{report_id}/status", response_model=dict)
-@limiter.limit("100/minute")
+@router.patch("/reports/{report_id}/status", response_model=dict, dependencies=[Depends(rate_limit("100/minute"))])
 async def update_report_status(
     request: Request,
     report_id: str,
@@ -151,8 +163,8 @@ async def update_report_status(
             status_request.resolution_notes
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
 
         logger.info("report_status_updated", report_id=report_id, new_status=status_request.status, admin_id=admin["user_id"])
         return data
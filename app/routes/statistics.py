@@ -1,22 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from typing import Optional
 from datetime import datetime
 import asyncpg
-import json
 
+from app.config import settings
 from app.services.database import db
+from app.services.redis_client import redis_client
 from app.middleware.auth import require_admin
+from app.middleware.rate_limit import rate_limit
 from app.utils.errors import map_sp_error_to_http
+from app.utils.etag import SHORT_LIVED, etag_json_response
 import structlog
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="", tags=["statistics"])
-limiter = Limiter(key_func=get_remote_address)
 
-@router.get("/statistics", response_model=dict)
-@limiter.limit("100/minute")
+@router.get("/statistics", response_model=dict, dependencies=[Depends(rate_limit("100/minute"))])
 async def get_moderation_statistics(
     request: Request,
     date_from: Optional[datetime] = Query(None),
@@ -24,19 +23,27 @@ async def get_moderation_statistics(
     admin: dict = Depends(require_admin)
 ):
     """Get overall moderation statistics for admin dashboard"""
+    # Dashboards poll this endpoint; serve repeat queries from Redis
+    cache_key = f"stats:{admin['user_id']}:{date_from.isoformat() if date_from else ''}:{date_to.isoformat() if date_to else ''}"
+    cached = await redis_client.cache_get(cache_key)
+    if cached is not None:
+        return etag_json_response(request, cached, SHORT_LIVED)
+
     try:
         result = await db.fetch_one(
-            "SELECT activity.sp_mod_get_statistics($1, $2, $3)",
+            "SELECT activity.sp_mod_get_statistics($1, $2, $3)::text",
             admin["user_id"],
             date_from,
             date_to
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # The SP already returns a JSON document; read as text (bypassing the json
+        # codec) so it is cached and sent unchanged
+        body = result[0].encode()
+        await redis_client.cache_set(cache_key, body, settings.STATISTICS_CACHE_TTL_SECONDS)
 
         logger.info("statistics_fetched", admin_id=admin["user_id"])
-        return data
+        return etag_json_response(request, body, SHORT_LIVED)
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
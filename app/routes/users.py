@@ -1,27 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 import asyncpg
-import json
 
 from app.models.requests import BanUserRequest, UnbanUserRequest
 from app.models.responses import BanUserResponse, UnbanUserResponse
 from app.services.database import db
 from app.services.email import email_client
-from app.middleware.auth import require_admin
+from app.middleware.auth import invalidate_user, require_admin
+from app.middleware.rate_limit import rate_limit
 from app.utils.errors import map_sp_error_to_http
+from app.utils.etag import etag_json_response
 import structlog
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
 
-@router.post("/users/{user_id}/ban", response_model=BanUserResponse)
-@limiter.limit("50/minute")
+@router.post("/users/{user_id}/ban", response_model=BanUserResponse, dependencies=[Depends(rate_limit("50/minute"))])
 async def ban_user(
     request: Request,
     user_id: str,
     ban_request: BanUserRequest,
+    background_tasks: BackgroundTasks,
     admin: dict = Depends(require_admin)
 ):
     """Ban or temporarily ban a user"""
@@ -35,15 +33,20 @@ async def ban_user(
             ban_request.ban_duration_hours
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
 
-        # Send ban notification email
-        user_email = data.get("email")  # Assume SP returns email
-        username = data.get("username")  # Assume SP returns username
+        # Status changed: drop the cached user record so auth reloads it next request
+        await invalidate_user(data["user_id"])
+
+        # Send ban notification email (runs after the response is sent)
+        # Recipient details come back in the same SP result (no extra lookup round trip)
+        user_email = data.get("email")
+        username = data.get("username")
 
         if user_email:
-            await email_client.send_email(
+            background_tasks.add_task(
+                email_client.send_email,
                 to=user_email,
                 template="user_banned",
                 context={
@@ -55,19 +58,19 @@ async def ban_user(
             )
 
         logger.info("user_banned", user_id=user_id, ban_type=ban_request.ban_type, admin_id=admin["user_id"])
-        return BanUserResponse(**data)
+        return data
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
         logger.error("ban_user_failed", error=message, user_id=user_id, admin_id=admin["user_id"])
         raise HTTPException(status_code=status_code, detail=message)
 
-@router.post("/users/{user_id}/unban", response_model=UnbanUserResponse)
-@limiter.limit("50/minute")
+@router.post("/users/{user_id}/unban", response_model=UnbanUserResponse, dependencies=[Depends(rate_limit("50/minute"))])
 async def unban_user(
     request: Request,
     user_id: str,
     unban_request: UnbanUserRequest,
+    background_tasks: BackgroundTasks,
     admin: dict = Depends(require_admin)
 ):
     """Remove ban from a user"""
@@ -79,15 +82,20 @@ async def unban_user(
             unban_request.unban_reason
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # JSON result from stored procedure (decoded by the pool's json codec)
+        data = result[0]
+
+        # Status changed: drop the cached user record so auth reloads it next request
+        await invalidate_user(data["user_id"])
 
-        # Send unban notification email
-        user_email = data.get("email")  # Assume SP returns email
-        username = data.get("username")  # Assume SP returns username
+        # Send unban notification email (runs after the response is sent)
+        # Recipient details come back in the same SP result (no extra lookup round trip)
+        user_email = data.get("email")
+        username = data.get("username")
 
         if user_email:
-            await email_client.send_email(
+            background_tasks.add_task(
+                email_client.send_email,
                 to=user_email,
                 template="user_unbanned",
                 context={
@@ -97,15 +105,14 @@ async def unban_user(
             )
 
         logger.info("user_unbanned", user_id=user_id, admin_id=admin["user_id"])
-        return UnbanUserResponse(**data)
+        return data
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
         logger.error("unban_user_failed", error=message, user_id=user_id, admin_id=admin["user_id"])
         raise HTTPException(status_code=status_code, detail=message)
 
-@router.get("/users/{user_id}/history", response_model=dict)
-@limiter.limit("100/minute")
+@router.get("/users/{user_id}/history", response_model=dict, dependencies=[Depends(rate_limit("100/minute"))])
 async def get_user_moderation_history(
     request: Request,
     user_id: str,
@@ -114,16 +121,17 @@ async def get_user_moderation_history(
     """Get complete moderation history for a user"""
     try:
         result = await db.fetch_one(
-            "SELECT activity.sp_mod_get_user_moderation_history($1, $2)",
+            "SELECT activity.sp_mod_get_user_moderation_history($1, $2)::text",
             admin["user_id"],
             user_id
         )
 
-        # Parse JSON result from stored procedure
-        data = json.loads(result[0])
+        # The SP already returns a JSON document; read as text (bypassing the json
+        # codec) so it is sent unchanged
+        body = result[0].encode()
 
         logger.info("user_history_fetched", user_id=user_id, admin_id=admin["user_id"])
-        return data
+        return etag_json_response(request, body)
 
     except asyncpg.PostgresError as e:
         status_code, message = map_sp_error_to_http(str(e))
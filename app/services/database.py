@@ -1,6 +1,7 @@
 import asyncpg
 from asyncpg.pool import Pool
 from app.config import settings
+from app.utils.json import dumps as json_dumps, loads as json_loads
 import structlog
 
 logger = structlog.get_logger()
@@ -18,13 +19,29 @@ class Database:
                 dsn=settings.DATABASE_URL,
                 min_size=5,
                 max_size=20,
-                command_timeout=60
+                command_timeout=60,
+                # Keep every prepared statement for the life of the connection
+                # (the app uses a small, fixed set of SP calls)
+                statement_cache_size=1024,
+                max_cached_statement_lifetime=0,
+                init=self._init_connection
             )
             logger.info("database_connected", min_size=5, max_size=20)
         except Exception as e:
             logger.error("database_connection_failed", error=str(e))
             raise
 
+    @staticmethod
+    async def _init_connection(conn):
+        """Decode json/jsonb values (SP results, users.roles) with orjson in the driver"""
+        for type_name in ("json", "jsonb"):
+            await conn.set_type_codec(
+                type_name,
+                encoder=lambda value: json_dumps(value).decode(),
+                decoder=json_loads,
+                schema="pg_catalog"
+            )
+
     async def disconnect(self):
         """Close database connection pool"""
         if self.pool:
@@ -41,6 +58,20 @@ class Database:
         async with self.pool.acquire() as conn:
             return await conn.fetch(query, *args)
 
+    async def stream(self, query: str, *args, prefetch: int = 250):
+        """
+        Execute query and yield rows through a server-side cursor.
+
+        For large exports: rows arrive in batches of `prefetch` per round trip
+        instead of materializing the whole result set at once. The connection
+        is held (inside a read transaction) until the generator is exhausted
+        or closed.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for row in conn.cursor(query, *args, prefetch=prefetch):
+                    yield row
+
     async def execute(self, query: str, *args):
         """Execute query without returning results"""
         async with self.pool.acquire() as conn:
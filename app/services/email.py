@@ -1,46 +1,152 @@
+import asyncio
 import httpx
 from app.config import settings
+from app.utils.json import dumps as json_dumps
 import structlog
 
 logger = structlog.get_logger()
 
+# Buffered sends are flushed every 50 ms or at 100 messages, whichever comes first
+_BATCH_SIZE = 100
+_FLUSH_INTERVAL_SECONDS = 0.05
+
+# Queued by close() to stop the flusher after everything ahead of it is sent
+_STOP = None
+
 class EmailAPIClient:
     """Client for email-api service"""
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, bulk_enabled: bool = False):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # /emails/send_bulk is opt-in (EMAIL_BULK_ENABLED); switched off if email-api lacks it
+        self.bulk_enabled = bulk_enabled
+        # Sized for bursts of notifications (e.g. mass bans). Short timeouts so a
+        # stuck email-api can't pile up pending sends.
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0, connect=1.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0)
+        )
+        self._queue: asyncio.Queue | None = None
+        self._flusher: asyncio.Task | None = None
+
+    def start(self):
+        """Start buffering sends into batches (called on application startup)"""
+        self._queue = asyncio.Queue()
+        self._flusher = asyncio.create_task(self._flush_loop())
 
     async def send_email(self, to: str, template: str, context: dict):
         """
         Send email via email-api service.
 
+        Once start() has been called the message is queued and delivered with
+        the next batch; otherwise it is sent immediately.
+
         Args:
             to: Recipient email address
             template: Email template name
             context: Template context data
         """
+        message = {
+            "to": to,
+            "template": template,
+            "context": context
+        }
+        if self._queue is not None:
+            self._queue.put_nowait(message)
+            return None
+        return await self._send_one(message)
+
+    async def _send_one(self, message: dict):
+        """POST a single message to /emails/send"""
         try:
-            response = await self.client.post(
-                f"{self.base_url}/emails/send",
-                json={
-                    "to": to,
-                    "template": template,
-                    "context": context
-                }
-            )
+            response = await self.client.post(f"{self.base_url}/emails/send", json=message)
             response.raise_for_status()
-            logger.info("email_sent", to=to, template=template)
+            logger.info("email_sent", to=message["to"], template=message["template"])
             return response.json()
         except httpx.HTTPError as e:
             # Log error but don't fail the request
-            logger.error("email_send_failed", error=str(e), to=to, template=template)
+            logger.error("email_send_failed", error=str(e), to=message["to"], template=message["template"])
             # Email failure should not break the API response
             return None
 
+    async def send_bulk(self, messages: list[dict]):
+        """
+        Deliver a batch of emails: one request to /emails/send_bulk when bulk
+        sending is enabled, otherwise one /emails/send request per message.
+
+        If the bulk request fails for any reason (4xx, 5xx, network), each
+        message is sent through /emails/send instead. A 404/405 means this
+        email-api has no bulk endpoint, so bulk sending is switched off for
+        later batches.
+        """
+        if not self.bulk_enabled:
+            await self._send_each(messages)
+            return
+
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/emails/send_bulk",
+                content=json_dumps(messages),
+                headers={"content-type": "application/json"}
+            )
+            response.raise_for_status()
+            logger.info("emails_sent", count=len(messages))
+            return
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (404, 405):
+                self.bulk_enabled = False
+                logger.warning("email_bulk_unsupported", status_code=e.response.status_code)
+            else:
+                logger.warning("email_bulk_send_failed", error=str(e), count=len(messages))
+        except httpx.HTTPError as e:
+            logger.warning("email_bulk_send_failed", error=str(e), count=len(messages))
+
+        await self._send_each(messages)
+
+    async def _send_each(self, messages: list[dict]):
+        """Send messages individually and concurrently (failures are logged per message)"""
+        await asyncio.gather(*(self._send_one(message) for message in messages))
+
+    async def _flush_loop(self):
+        """Collect queued messages into batches and send them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await self._queue.get()
+            if message is _STOP:
+                return
+
+            batch = [message]
+            deadline = loop.time() + _FLUSH_INTERVAL_SECONDS
+            stopping = False
+            while len(batch) < _BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message is _STOP:
+                    stopping = True
+                    break
+                batch.append(message)
+
+            try:
+                await self.send_bulk(batch)
+            except Exception as e:
+                # Keep the flusher alive; the batch is lost but later sends still go out
+                logger.error("email_flush_failed", error=str(e), count=len(batch))
+            if stopping:
+                return
+
     async def close(self):
-        """Close HTTP client"""
+        """Flush queued emails and close HTTP client"""
+        if self._flusher is not None:
+            self._queue.put_nowait(_STOP)
+            await self._flusher
+            self._queue = None
+            self._flusher = None
         await self.client.aclose()
 
 # Global email client instance
-email_client = EmailAPIClient(settings.EMAIL_API_URL)
+email_client = EmailAPIClient(settings.EMAIL_API_URL, bulk_enabled=settings.EMAIL_BULK_ENABLED)
@@ -0,0 +1,81 @@
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from app.config import settings
+import structlog
+
+logger = structlog.get_logger()
+
+# Every authenticated request waits on Redis (rate limit + user cache)
+_SOCKET_TIMEOUT_SECONDS = 0.25
+
+class RedisClient:
+    """Client for the shared Redis instance (rate limiting, caching)"""
+
+    def __init__(self, url: str):
+        self.url = url
+        # Connections are opened lazily from the pool on first command. Short
+        # timeouts turn an unresponsive Redis into a quick RedisError, so rate
+        # limiting fails open and caches miss instead of requests hanging.
+        self.client = redis.from_url(
+            url,
+            socket_connect_timeout=_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=_SOCKET_TIMEOUT_SECONDS
+        )
+
+    async def cache_get(self, key: str) -> bytes | None:
+        """
+        Read a cached value.
+
+        Returns:
+            Raw bytes, or None on a miss or if Redis is unavailable
+        """
+        try:
+            return await self.client.get(key)
+        except RedisError as e:
+            logger.warning("redis_cache_get_failed", key=key, error=str(e))
+            return None
+
+    async def cache_set(self, key: str, value: bytes, ttl_seconds: int):
+        """Store a value with an expiry; failures are logged and ignored"""
+        try:
+            await self.client.set(key, value, ex=ttl_seconds)
+        except RedisError as e:
+            logger.warning("redis_cache_set_failed", key=key, error=str(e))
+
+    async def cache_get_many(self, keys: list[str]) -> list[bytes | None]:
+        """
+        Read several cached values in one round trip (MGET).
+
+        Returns:
+            Values in key order; None for misses, or for every key if Redis is unavailable
+        """
+        try:
+            return await self.client.mget(keys)
+        except RedisError as e:
+            logger.warning("redis_cache_get_failed", keys=keys, error=str(e))
+            return [None] * len(keys)
+
+    async def cache_set_many(self, values: dict[str, bytes], ttl_seconds: int):
+        """Store several values with the same expiry in one round trip; failures are logged and ignored"""
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(key, value, ex=ttl_seconds)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("redis_cache_set_failed", keys=list(values), error=str(e))
+
+    async def cache_delete(self, *keys: str):
+        """Remove cached values; failures are logged and ignored"""
+        try:
+            await self.client.delete(*keys)
+        except RedisError as e:
+            logger.warning("redis_cache_delete_failed", keys=keys, error=str(e))
+
+    async def close(self):
+        """Close Redis connection pool"""
+        await self.client.aclose()
+        logger.info("redis_disconnected")
+
+# Global Redis client instance
+redis_client = RedisClient(settings.REDIS_URL)
@@ -20,6 +20,7 @@ ERROR_CODE_MAPPING: Dict[str, int] = {
     'NO_MAIN_PHOTO': 400,
     'CANNOT_SELF_REPORT': 400,
     'CANNOT_SELF_BAN': 400,
+    'INVALID_CURSOR': 400,
 
     # 403 Forbidden
     'INSUFFICIENT_PERMISSIONS': 403,
@@ -37,6 +38,9 @@ ERROR_CODE_MAPPING: Dict[str, int] = {
     'DUPLICATE_REPORT': 409,
 }
 
+# Bound method, skips the attribute lookup per call
+_lookup_status = ERROR_CODE_MAPPING.get
+
 def map_sp_error_to_http(error_message: str) -> tuple[int, str]:
     """
     Map stored procedure error to HTTP status code.
@@ -48,10 +52,11 @@ def map_sp_error_to_http(error_message: str) -> tuple[int, str]:
         Tuple of (status_code, error_message)
     """
     # Extract error code (before colon)
-    error_code = error_message.split(':')[0].strip() if ':' in error_message else error_message.strip()
+    code, sep, _ = error_message.partition(':')
+    error_code = code.strip() if sep else error_message.strip()
 
     # Look up status code
-    status_code = ERROR_CODE_MAPPING.get(error_code, 500)
+    status_code = _lookup_status(error_code, 500)
 
     return status_code, error_message
 
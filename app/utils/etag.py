@@ -0,0 +1,32 @@
+from fastapi import Request
+from fastapi.responses import Response
+import hashlib
+
+# Work queues must reflect moderation actions at once: clients revalidate on
+# every request (still answered with an empty 304 when nothing changed)
+REVALIDATE = "private, no-cache"
+# Aggregates that may be reused for a few seconds without revalidating
+SHORT_LIVED = "private, max-age=15"
+
+def etag_json_response(request: Request, body: bytes, cache_control: str = REVALIDATE) -> Response:
+    """
+    Return a JSON body with a weak ETag, or 304 if the client already has it.
+
+    Args:
+        request: Incoming request (If-None-Match is checked)
+        body: Serialized JSON response body
+        cache_control: Cache-Control header value (REVALIDATE or SHORT_LIVED)
+
+    Returns:
+        200 Response with the body, or an empty 304 Not Modified
+    """
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
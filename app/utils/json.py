@@ -0,0 +1,26 @@
+# Fast JSON helpers: orjson when installed, stdlib json otherwise.
+# dumps() returns bytes, formatted like Pydantic's JSON output (UTC as "Z").
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_UTC_Z)
+except ImportError:
+    import json
+    from datetime import date, datetime, timezone
+
+    loads = json.loads
+
+    def _default(obj):
+        if isinstance(obj, datetime):
+            if obj.utcoffset() == timezone.utc.utcoffset(None):
+                return obj.isoformat().replace("+00:00", "Z")
+            return obj.isoformat()
+        if isinstance(obj, date):
+            return obj.isoformat()
+        return str(obj)
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode()
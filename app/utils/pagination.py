@@ -0,0 +1,64 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from fastapi import HTTPException
+from typing import Optional, Tuple
+from uuid import UUID
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """
+    Build an opaque keyset cursor pointing at the last row of a page.
+
+    Returns:
+        URL-safe string encoding (created_at, row_id)
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def decode_cursor(cursor: Optional[str], offset: int = 0) -> Tuple[Optional[datetime], Optional[UUID]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    The cursor already marks where the page starts, so a non-zero offset on
+    top of it would silently skip rows; that combination is rejected.
+
+    Returns:
+        (created_at, row_id), or (None, None) when no cursor was given
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or combined with an offset
+    """
+    if not cursor:
+        return None, None
+    if offset:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR: offset cannot be combined with cursor")
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, row_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR: Malformed pagination cursor")
+
+def next_cursor(rows: list, limit: int, id_column: str) -> Optional[str]:
+    """Cursor for the page after rows, or None if this was the last page"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["created_at"], last[id_column])
+
+def pagination_suffix(limit: int, offset: int, total: int, cursor: Optional[str]) -> bytes:
+    """
+    Closing bytes of a list response: the pagination object plus the final brace.
+
+    Used after a prefix like b'{"success":true,"reports":' and the serialized
+    rows, so the wrapper dict is never built or re-serialized.
+    """
+    # Cursors are URL-safe base64, so they never need JSON escaping
+    next_cursor_json = b"null" if cursor is None else b'"' + cursor.encode() + b'"'
+    return b"".join((
+        b',"pagination":{"limit":', str(limit).encode(),
+        b',"offset":', str(offset).encode(),
+        b',"total":', str(total).encode(),
+        b',"next_cursor":', next_cursor_json,
+        b"}}"
+    ))
+
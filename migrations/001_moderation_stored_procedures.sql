@@ -174,16 +174,24 @@ $$;
 -- ============================================================================
 -- SP 2: sp_mod_get_reports
 -- Purpose: Retrieve reports with filtering and pagination (admin view)
+-- Pagination: keyset on (created_at, report_id) via p_cursor_*; p_offset kept
+--             for existing clients
 -- ============================================================================
 
+-- Previous signature (offset only); dropped so calls don't become ambiguous
+DROP FUNCTION IF EXISTS activity.sp_mod_get_reports(UUID, VARCHAR, VARCHAR, VARCHAR, INT, INT);
+
 CREATE OR REPLACE FUNCTION activity.sp_mod_get_reports(
     p_admin_user_id UUID,
     p_status VARCHAR(20) DEFAULT NULL,
     p_target_type VARCHAR(50) DEFAULT NULL,
     p_report_type VARCHAR(50) DEFAULT NULL,
     p_limit INT DEFAULT 50,
-    p_offset INT DEFAULT 0
+    p_offset INT DEFAULT 0,
+    p_cursor_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_cursor_id UUID DEFAULT NULL
 ) RETURNS TABLE (
+    -- Column order is part of the contract: get_reports unpacks rows positionally
     report_id UUID,
     reporter_user_id UUID,
     reporter_username VARCHAR(100),
@@ -264,7 +272,9 @@ BEGIN
     WHERE (p_status IS NULL OR r.status::VARCHAR = p_status)
       AND (p_target_type IS NULL OR r.target_type = p_target_type)
       AND (p_report_type IS NULL OR r.report_type::VARCHAR = p_report_type)
-    ORDER BY r.created_at DESC
+      -- Keyset: only rows after the last one of the previous page
+      AND (p_cursor_created_at IS NULL OR (r.created_at, r.report_id) < (p_cursor_created_at, p_cursor_id))
+    ORDER BY r.created_at DESC, r.report_id DESC
     LIMIT p_limit OFFSET p_offset;
 END;
 $$;
@@ -496,12 +506,19 @@ $$;
 -- ============================================================================
 -- SP 6: sp_mod_get_pending_photos
 -- Purpose: Get list of users with pending main photo moderation
+-- Pagination: keyset on (created_at, user_id) via p_cursor_*; p_offset kept
+--             for existing clients
 -- ============================================================================
 
+-- Previous signature (offset only); dropped so calls don't become ambiguous
+DROP FUNCTION IF EXISTS activity.sp_mod_get_pending_photos(UUID, INT, INT);
+
 CREATE OR REPLACE FUNCTION activity.sp_mod_get_pending_photos(
     p_admin_user_id UUID,
     p_limit INT DEFAULT 50,
-    p_offset INT DEFAULT 0
+    p_offset INT DEFAULT 0,
+    p_cursor_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_cursor_id UUID DEFAULT NULL
 ) RETURNS TABLE (
     user_id UUID,
     username VARCHAR(100),
@@ -537,7 +554,9 @@ BEGIN
     WHERE u.main_photo_moderation_status = 'pending'::activity.photo_moderation_status
       AND u.main_photo_url IS NOT NULL
       AND u.main_photo_url != ''
-    ORDER BY u.created_at ASC
+      -- Keyset: only rows after the last one of the previous page
+      AND (p_cursor_created_at IS NULL OR (u.created_at, u.user_id) > (p_cursor_created_at, p_cursor_id))
+    ORDER BY u.created_at ASC, u.user_id ASC
     LIMIT p_limit OFFSET p_offset;
 END;
 $$;
@@ -0,0 +1,16 @@
+-- ============================================================================
+-- Migration 003: Indexes for keyset pagination
+-- ============================================================================
+-- Description: sp_mod_get_reports and sp_mod_get_pending_photos page by
+-- (created_at, id) cursors instead of OFFSET. These indexes match their sort
+-- order so each page is an index range scan of LIMIT rows.
+-- ============================================================================
+
+-- Reports list: ORDER BY created_at DESC, report_id DESC
+CREATE INDEX IF NOT EXISTS idx_reports_created_at_id
+    ON activity.reports (created_at DESC, report_id DESC);
+
+-- Pending photo queue: ORDER BY created_at ASC, user_id ASC (pending only)
+CREATE INDEX IF NOT EXISTS idx_users_pending_photo_created_at
+    ON activity.users (created_at, user_id)
+    WHERE main_photo_moderation_status = 'pending';
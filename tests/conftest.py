@@ -1,20 +1,26 @@
 import pytest
 import asyncio
-from httpx import AsyncClient
+import jwt
+import uuid
+from httpx import ASGITransport, AsyncClient
+from app.config import settings
 from app.main import app
+from app.middleware import auth
 from app.services.database import db
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+# Run async tests on uvloop, as in production (pytest-asyncio creates loops from the policy).
+# uvloop is not available on Windows; the default loop is used there.
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 @pytest.fixture
 async def client():
-    """Create test client"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    """Create test client (app called in-process through ASGITransport)"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
 
 @pytest.fixture
@@ -29,3 +35,14 @@ async def user_token():
     """Generate user JWT token for testing"""
     # TODO: Generate valid JWT with regular user role
     return "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test-user-token"
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Authorization headers for a valid admin token (user lookup stubbed out)"""
+    async def fetch_user(user_id):
+        return {"user_id": user_id, "email": "admin@example.com", "roles": ["admin"], "is_verified": True, "status": "active"}
+
+    monkeypatch.setattr(auth, "fetch_user", fetch_user)
+    # Unique subject per test so cached tokens never carry over
+    token = jwt.encode({"sub": str(uuid.uuid4())}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
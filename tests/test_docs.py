@@ -0,0 +1,22 @@
+import pytest
+from httpx import AsyncClient
+
+class TestDocsEndpoints:
+    """Tests for API documentation endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_openapi_schema(self, client: AsyncClient):
+        """Test OpenAPI schema is served with the bearer security scheme"""
+        response = await client.get("/openapi.json")
+        assert response.status_code == 200
+        data = response.json()
+        assert "/moderation/reports" in data["paths"]
+        assert "BearerAuth" in data["components"]["securitySchemes"]
+
+    @pytest.mark.asyncio
+    async def test_swagger_ui(self, client: AsyncClient):
+        """Test Swagger UI page points at the OpenAPI schema"""
+        response = await client.get("/docs")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert "/openapi.json" in response.text
@@ -0,0 +1,88 @@
+import httpx
+import json
+import pytest
+from app.services.email import EmailAPIClient
+
+def make_client(handler, bulk_enabled: bool = True) -> EmailAPIClient:
+    """EmailAPIClient whose HTTP calls go to handler instead of the network"""
+    email = EmailAPIClient("http://email-api", bulk_enabled=bulk_enabled)
+    email.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return email
+
+MESSAGES = [
+    {"to": "a@example.com", "template": "user_banned", "context": {}},
+    {"to": "b@example.com", "template": "user_banned", "context": {}}
+]
+
+class TestEmailAPIClient:
+    """Tests for batched email delivery"""
+
+    @pytest.mark.asyncio
+    async def test_queued_emails_sent_in_one_request(self):
+        """Test emails queued together are delivered with a single bulk POST"""
+        requests = []
+
+        def handler(request: httpx.Request):
+            requests.append(request)
+            return httpx.Response(200, json={"success": True})
+
+        email = make_client(handler)
+        email.start()
+        for i in range(3):
+            await email.send_email(to=f"user{i}@example.com", template="user_banned", context={})
+        await email.close()
+
+        assert [r.url.path for r in requests] == ["/emails/send_bulk"]
+        assert len(json.loads(requests[0].content)) == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_disabled_sends_individually(self):
+        """Test batches go through /emails/send when bulk sending is off (the default)"""
+        paths = []
+
+        def handler(request: httpx.Request):
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"success": True})
+
+        email = make_client(handler, bulk_enabled=False)
+        await email.send_bulk(MESSAGES)
+        await email.client.aclose()
+
+        assert paths == ["/emails/send", "/emails/send"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_unsupported_is_remembered(self):
+        """Test a 404 from the bulk endpoint falls back and stops later bulk attempts"""
+        paths = []
+
+        def handler(request: httpx.Request):
+            paths.append(request.url.path)
+            if request.url.path == "/emails/send_bulk":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"success": True})
+
+        email = make_client(handler)
+        await email.send_bulk(MESSAGES)
+        await email.send_bulk(MESSAGES)
+        await email.client.aclose()
+
+        assert email.bulk_enabled is False
+        assert paths == ["/emails/send_bulk"] + ["/emails/send"] * 4
+
+    @pytest.mark.asyncio
+    async def test_bulk_server_error_falls_back(self):
+        """Test a 5xx from the bulk endpoint resends each message without disabling bulk"""
+        paths = []
+
+        def handler(request: httpx.Request):
+            paths.append(request.url.path)
+            if request.url.path == "/emails/send_bulk":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"success": True})
+
+        email = make_client(handler)
+        await email.send_bulk(MESSAGES)
+        await email.client.aclose()
+
+        assert email.bulk_enabled is True
+        assert paths == ["/emails/send_bulk", "/emails/send", "/emails/send"]
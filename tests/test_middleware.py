@@ -0,0 +1,181 @@
+import jwt
+import pytest
+import uuid
+from httpx import AsyncClient
+from app.config import settings
+from app.middleware import auth
+from app.middleware.rate_limit import rate_limiter
+from app.services.database import db
+from app.services.redis_client import redis_client
+
+class TestCorrelationMiddleware:
+    """Tests for X-Trace-ID propagation"""
+
+    @pytest.mark.asyncio
+    async def test_trace_id_generated(self, client: AsyncClient):
+        """Test a trace ID is generated when none is supplied"""
+        response = await client.get("/health")
+        assert response.headers.get("X-Trace-ID")
+
+    @pytest.mark.asyncio
+    async def test_trace_id_propagated(self, client: AsyncClient):
+        """Test an incoming trace ID is echoed back"""
+        response = await client.get("/health", headers={"X-Trace-ID": "trace-123"})
+        assert response.headers["X-Trace-ID"] == "trace-123"
+
+class TestCORSMiddleware:
+    """Tests for CORS handling"""
+
+    @pytest.mark.asyncio
+    async def test_preflight(self, client: AsyncClient):
+        """Test preflight requests are answered without routing"""
+        response = await client.options(
+            "/moderation/reports",
+            headers={
+                "Origin": "http://example.com",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "authorization"
+            }
+        )
+        assert response.status_code == 200
+        assert response.headers["Access-Control-Allow-Origin"] == "http://example.com"
+        assert response.headers["Access-Control-Allow-Headers"] == "authorization"
+
+    @pytest.mark.asyncio
+    async def test_simple_request(self, client: AsyncClient):
+        """Test simple requests get the allow-origin header"""
+        response = await client.get("/health", headers={"Origin": "http://example.com"})
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+class TestAuthMiddleware:
+    """Tests for JWT authentication before routing"""
+
+    @pytest.mark.asyncio
+    async def test_missing_token(self, client: AsyncClient):
+        """Test requests without a bearer token are rejected"""
+        response = await client.get("/moderation/reports")
+        assert response.status_code == 403
+        assert response.json() == {"detail": "Not authenticated"}
+
+    @pytest.mark.asyncio
+    async def test_invalid_token(self, client: AsyncClient, admin_token: str):
+        """Test requests with an invalid token are rejected"""
+        response = await client.get(
+            "/moderation/reports",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid authentication credentials"}
+
+    @pytest.mark.asyncio
+    async def test_rejections_do_not_share_headers(self, client: AsyncClient):
+        """Test headers added to one rejected response don't carry over to the next"""
+        for trace_id in ("t0", "t1"):
+            response = await client.get(
+                "/moderation/reports",
+                headers={"Origin": "http://example.com", "X-Trace-ID": trace_id}
+            )
+            assert response.status_code == 403
+        assert response.headers.get_list("x-trace-id") == ["t1"]
+        assert response.headers.get_list("access-control-allow-origin") == ["*"]
+
+    @pytest.mark.asyncio
+    async def test_health_not_authenticated(self, client: AsyncClient):
+        """Test endpoints outside the API prefix skip authentication"""
+        response = await client.get("/health")
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_valid_token_reaches_route(self, client: AsyncClient, monkeypatch):
+        """Test the authenticated user is passed on to route dependencies"""
+        async def fetch_one(query, *args):
+            return {"user_id": args[0], "email": "user@example.com", "roles": [], "is_verified": True, "status": "active"}
+
+        monkeypatch.setattr(db, "fetch_one", fetch_one)
+        token = jwt.encode({"sub": "550e8400-e29b-41d4-a716-446655440001"}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        response = await client.get(
+            "/moderation/reports",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        # Authenticated, but not an admin
+        assert response.status_code == 403
+        assert response.json()["detail"].startswith("INSUFFICIENT_PERMISSIONS")
+
+    @pytest.mark.asyncio
+    async def test_user_served_from_redis_cache(self, client: AsyncClient, monkeypatch):
+        """Test a cached user record skips the database lookup"""
+        async def cache_get(key):
+            assert key == "auth:user:550e8400-e29b-41d4-a716-446655440003"
+            return b'{"user_id":"550e8400-e29b-41d4-a716-446655440003","email":"user@example.com","roles":[],"is_verified":true,"status":"active"}'
+
+        async def fetch_one(query, *args):
+            raise AssertionError("database should not be queried")
+
+        monkeypatch.setattr(redis_client, "cache_get", cache_get)
+        monkeypatch.setattr(db, "fetch_one", fetch_one)
+        token = jwt.encode({"sub": "550e8400-e29b-41d4-a716-446655440003"}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        response = await client.get(
+            "/moderation/reports",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 403
+        assert response.json()["detail"].startswith("INSUFFICIENT_PERMISSIONS")
+
+class TestUserLookup:
+    """Tests for the shared user caches in app.middleware.auth"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_users_normalizes_records(self, monkeypatch):
+        """Test batched lookups return the same dict shape as fetch_user"""
+        cached_id = "550e8400-e29b-41d4-a716-446655440004"
+        db_id = "550e8400-e29b-41d4-a716-446655440005"
+        stored = {}
+
+        async def cache_get_many(keys):
+            assert keys == [f"auth:user:{cached_id}", f"auth:user:{db_id}"]
+            return [b'{"user_id":"' + cached_id.encode() + b'","email":"a@example.com","roles":[],"is_verified":true,"status":"active"}', None]
+
+        async def cache_set_many(values, ttl_seconds):
+            stored.update(values)
+
+        async def fetch_all(query, *args):
+            assert args[0] == [db_id]
+            return [{"user_id": uuid.UUID(db_id), "email": "b@example.com", "roles": ["moderator"], "is_verified": True, "status": "active"}]
+
+        monkeypatch.setattr(redis_client, "cache_get_many", cache_get_many)
+        monkeypatch.setattr(redis_client, "cache_set_many", cache_set_many)
+        monkeypatch.setattr(db, "fetch_all", fetch_all)
+
+        token = auth._request_user_cache.set({})
+        try:
+            users = await auth.fetch_users([cached_id, db_id])
+            assert users[db_id] == {"user_id": db_id, "email": "b@example.com", "roles": ["moderator"], "is_verified": True, "status": "active"}
+            assert users[cached_id]["email"] == "a@example.com"
+            # Later single lookups in the same request reuse the normalized dict
+            assert await auth.fetch_user(db_id) is users[db_id]
+        finally:
+            auth._request_user_cache.reset(token)
+        assert list(stored) == [f"auth:user:{db_id}"]
+
+class TestRateLimit:
+    """Tests for the Redis-backed rate limit dependency"""
+
+    @pytest.mark.asyncio
+    async def test_limit_exceeded(self, client: AsyncClient, monkeypatch):
+        """Test requests over the limit are rejected with 429"""
+        async def fetch_one(query, *args):
+            return {"user_id": args[0], "email": "user@example.com", "roles": [], "is_verified": True, "status": "active"}
+
+        async def hit(key, limit, window_seconds):
+            return False, 12
+
+        monkeypatch.setattr(db, "fetch_one", fetch_one)
+        monkeypatch.setattr(rate_limiter, "hit", hit)
+        token = jwt.encode({"sub": "550e8400-e29b-41d4-a716-446655440002"}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        response = await client.get(
+            "/moderation/reports",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 429
+        assert response.json()["detail"] == "Rate limit exceeded: 100 per 1 minute"
+        assert response.headers["Retry-After"] == "12"
@@ -1,5 +1,32 @@
 import pytest
+import uuid
+from datetime import datetime, timezone
 from httpx import AsyncClient
+from app.services.database import db
+
+def report_row() -> dict:
+    """One sp_mod_get_reports row, keys in SP column order"""
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        "report_id": uuid.UUID("550e8400-e29b-41d4-a716-446655440010"),
+        "reporter_user_id": uuid.UUID("550e8400-e29b-41d4-a716-446655440011"),
+        "reporter_username": "reporter",
+        "reporter_email": "reporter@example.com",
+        "reported_user_id": None,
+        "reported_username": None,
+        "reported_email": None,
+        "target_type": "post",
+        "target_id": uuid.UUID("550e8400-e29b-41d4-a716-446655440012"),
+        "report_type": "spam",
+        "description": None,
+        "status": "pending",
+        "reviewed_by_user_id": None,
+        "reviewed_by_username": None,
+        "reviewed_at": None,
+        "resolution_notes": None,
+        "created_at": created,
+        "updated_at": created
+    }
 
 class TestReportsEndpoints:
     """Tests for report endpoints"""
@@ -55,6 +82,73 @@ class TestReportsEndpoints:
         # Should return validation error
         # assert response.status_code == 422
 
+    @pytest.mark.asyncio
+    async def test_get_reports_response_shape(self, client: AsyncClient, admin_headers: dict, monkeypatch):
+        """Test SP rows are returned in the ReportResponse layout"""
+        row = report_row()
+
+        async def fetch_all(query, *args):
+            # asyncpg Records unpack positionally in SP column order
+            return [tuple(row.values())]
+
+        monkeypatch.setattr(db, "fetch_all", fetch_all)
+        response = await client.get("/moderation/reports?limit=10", headers=admin_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["pagination"] == {"limit": 10, "offset": 0, "total": 1, "next_cursor": None}
+        # Work queue: clients must revalidate every time
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        report = data["reports"][0]
+        assert report["reporter"] == {
+            "user_id": str(row["reporter_user_id"]),
+            "username": "reporter",
+            "email": "reporter@example.com"
+        }
+        assert report["reported_user"] is None
+        assert report["created_at"] == "2024-01-01T00:00:00Z"
+        assert "resolution_notes" not in report
+
+    @pytest.mark.asyncio
+    async def test_get_reports_keyset_cursor(self, client: AsyncClient, admin_headers: dict, monkeypatch):
+        """Test a full page returns next_cursor and the cursor is passed back to the SP"""
+        row = report_row()
+        calls = []
+
+        async def fetch_all(query, *args):
+            calls.append(args)
+            return [tuple(row.values())]
+
+        monkeypatch.setattr(db, "fetch_all", fetch_all)
+        response = await client.get("/moderation/reports?limit=1", headers=admin_headers)
+        cursor = response.json()["pagination"]["next_cursor"]
+        assert cursor
+
+        response = await client.get(f"/moderation/reports?limit=1&cursor={cursor}", headers=admin_headers)
+        assert response.status_code == 200
+        assert calls[-1][-2:] == (row["created_at"], row["report_id"])
+
+    @pytest.mark.asyncio
+    async def test_get_reports_invalid_cursor(self, client: AsyncClient, admin_headers: dict):
+        """Test a malformed cursor is rejected"""
+        response = await client.get("/moderation/reports?cursor=not-a-cursor", headers=admin_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("INVALID_CURSOR")
+
+    @pytest.mark.asyncio
+    async def test_get_reports_cursor_with_offset_rejected(self, client: AsyncClient, admin_headers: dict, monkeypatch):
+        """Test offset can't be combined with a cursor (it would skip rows)"""
+        async def fetch_all(query, *args):
+            return [tuple(report_row().values())]
+
+        monkeypatch.setattr(db, "fetch_all", fetch_all)
+        response = await client.get("/moderation/reports?limit=1", headers=admin_headers)
+        cursor = response.json()["pagination"]["next_cursor"]
+
+        response = await client.get(f"/moderation/reports?limit=1&offset=1&cursor={cursor}", headers=admin_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("INVALID_CURSOR")
+
 # Add more tests for:
 # - GET /moderation/reports/{report_id}
 # - PATCH /moderation/reports/{report_id}/status
@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient
+from app.services.database import db
+from app.services.redis_client import redis_client
+
+class TestStatisticsEndpoints:
+    """Tests for statistics endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_statistics_cached(self, client: AsyncClient, admin_headers: dict, monkeypatch):
+        """Test repeat requests are served from the cache without calling the SP"""
+        cache = {}
+        calls = []
+
+        async def cache_get(key):
+            return cache.get(key)
+
+        async def cache_set(key, value, ttl_seconds):
+            cache[key] = value
+
+        async def fetch_one(query, *args):
+            calls.append(args)
+            return ['{"total_reports": 3}']
+
+        monkeypatch.setattr(redis_client, "cache_get", cache_get)
+        monkeypatch.setattr(redis_client, "cache_set", cache_set)
+        monkeypatch.setattr(db, "fetch_one", fetch_one)
+
+        for _ in range(2):
+            response = await client.get("/moderation/statistics?date_from=2024-01-01T00:00:00", headers=admin_headers)
+            assert response.status_code == 200
+            assert response.json() == {"total_reports": 3}
+
+        assert len(calls) == 1
+        assert list(cache) == [f"stats:{calls[0][0]}:2024-01-01T00:00:00:"]
+
+    @pytest.mark.asyncio
+    async def test_statistics_not_modified(self, client: AsyncClient, admin_headers: dict, monkeypatch):
+        """Test a matching If-None-Match returns 304 without a body"""
+        async def cache_get(key):
+            return b'{"total_reports": 3}'
+
+        monkeypatch.setattr(redis_client, "cache_get", cache_get)
+
+        response = await client.get("/moderation/statistics", headers=admin_headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, max-age=15"
+
+        response = await client.get("/moderation/statistics", headers={**admin_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
@@ -0,0 +1,66 @@
+import jwt
+import pytest
+import uuid
+from httpx import AsyncClient
+from app.config import settings
+from app.middleware import auth
+from app.services.database import db
+from app.services.redis_client import redis_client
+
+def bearer(user_id: str) -> dict:
+    token = jwt.encode({"sub": user_id}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+class TestUserEndpoints:
+    """Tests for user sanction endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_ban_applies_to_next_request(self, client: AsyncClient, monkeypatch):
+        """Test a banned user's already-verified token stops working immediately"""
+        admin_id = str(uuid.uuid4())
+        target_id = str(uuid.uuid4())
+        users = {
+            admin_id: {"user_id": admin_id, "email": "admin@example.com", "roles": ["admin"], "is_verified": True, "status": "active"},
+            target_id: {"user_id": target_id, "email": "user@example.com", "roles": [], "is_verified": True, "status": "active"}
+        }
+        deleted = []
+
+        async def fetch_user(user_id):
+            return dict(users[user_id])
+
+        async def fetch_one(query, *args):
+            # sp_mod_ban_user
+            users[target_id]["status"] = "banned"
+            return [{
+                "success": True,
+                # Echo the ID as given, so invalidate_user has to normalize it
+                "user_id": args[1],
+                "status": "banned",
+                "ban_expires_at": None,
+                "ban_reason": "spam",
+                "banned_at": "2024-01-01T00:00:00Z"
+            }]
+
+        async def cache_delete(*keys):
+            deleted.extend(keys)
+
+        monkeypatch.setattr(auth, "fetch_user", fetch_user)
+        monkeypatch.setattr(db, "fetch_one", fetch_one)
+        monkeypatch.setattr(redis_client, "cache_delete", cache_delete)
+
+        # Authenticated (token now cached), but not an admin
+        response = await client.get("/moderation/reports", headers=bearer(target_id))
+        assert response.json()["detail"].startswith("INSUFFICIENT_PERMISSIONS")
+
+        response = await client.post(
+            # Non-canonical (uppercase) ID in the path must still hit the caches
+            f"/moderation/users/{target_id.upper()}/ban",
+            json={"ban_type": "permanent", "ban_reason": "spam"},
+            headers=bearer(admin_id)
+        )
+        assert response.status_code == 200
+        assert deleted == [f"auth:user:{target_id}"]
+
+        response = await client.get("/moderation/reports", headers=bearer(target_id))
+        assert response.status_code == 403
+        assert response.json() == {"detail": "Account is banned"}